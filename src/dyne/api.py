@@ -1,8 +1,13 @@
 import os
 from functools import wraps
 from pathlib import Path
+from typing import List
 
+import httpx
+import marshmallow as ma
+import pydantic as pd
 import uvicorn
+from sqlalchemy import inspect as sa_inspect
 from sqlalchemy.orm import DeclarativeBase, Query
 from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.errors import ServerErrorMiddleware
@@ -10,25 +15,27 @@ from starlette.middleware.exceptions import ExceptionMiddleware
 from starlette.middleware.gzip import GZipMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.sessions import SessionMiddleware
-from starlette.middleware.trustedhost import TrustedHostMiddleware
-from starlette.testclient import TestClient
 
 from . import status_codes
 from .background import BackgroundQueue
 from .ext.schema import Schema as OpenAPISchema
 from .formats import get_formats
+from .middleware import TrustedHostMiddleware
 from .routes import Router
 from .staticfiles import StaticFiles
 from .statics import DEFAULT_CORS_PARAMS, DEFAULT_OPENAPI_THEME, DEFAULT_SECRET_KEY
 from .templates import Templates
+from .testclient import TestClient
 
 
 class API:
     """The primary web-service class.
 
+    :param debug: If ``True``, show tracebacks on errors and reload templates when they change on disk.
     :param static_dir: The directory to use for static files. Will be created for you if it doesn't already exist.
     :param templates_dir: The directory to use for templates. Will be created for you if it doesn't already exist.
     :param auto_escape: If ``True``, HTML and XML templates will automatically be escaped.
+    :param template_bytecode_cache: A ``jinja2.BytecodeCache``, e.g. ``jinja2.FileSystemBytecodeCache()``, to share compiled templates across processes.
     :param enable_hsts: If ``True``, send all responses to HTTPS URLs.
     :param openapi_theme: OpenAPI documentation theme, must be one of ``elements``, ``rapidoc``, ``redoc``, ``swaggerui``
     """
@@ -58,6 +65,7 @@ class API:
         cors_params=DEFAULT_CORS_PARAMS,
         allowed_hosts=None,
         openapi_theme=DEFAULT_OPENAPI_THEME,
+        template_bytecode_cache=None,
     ):
         self.background = BackgroundQueue()
 
@@ -94,8 +102,9 @@ class API:
 
         self.formats = get_formats()
 
-        # Cached requests session.
+        # Cached test clients, built on first use.
         self._session = None
+        self._async_session = None
 
         self.default_endpoint = None
         self.app = ExceptionMiddleware(self.router, debug=debug)
@@ -127,10 +136,11 @@ class API:
         )
 
         # TODO: Update docs for templates
-        self.templates = Templates(directory=templates_dir)
-        self.requests = (
-            self.session()
-        )  #: A Requests session that is connected to the ASGI app.
+        self.templates = Templates(
+            directory=templates_dir,
+            auto_reload=debug,
+            bytecode_cache=template_bytecode_cache,
+        )
 
     @property
     def static_app(self):
@@ -169,10 +179,7 @@ class API:
 
         :param path: The path portion of a URL, to test all known routes against.
         """
-        for route in self.router.routes:
-            match, _ = route.matches(path)
-            if match:
-                return route
+        return self.router.match(path)
 
     def add_route(
         self,
@@ -288,7 +295,7 @@ class API:
         :param route: String representation of the route to be used (shouldn't be parameterized).
         :param app: The other WSGI / ASGI app.
         """
-        self.router.apps.update({route: app})
+        self.router.mount(route, app)
 
     def session(self, base_url="http://;"):
         """Testing HTTP client. Returns a Requests session object, able to send HTTP requests to the dyne application.
@@ -300,6 +307,24 @@ class API:
             self._session = TestClient(self, base_url=base_url)
         return self._session
 
+    @property
+    def requests(self):
+        """A Requests session that is connected to the ASGI app."""
+        return self.session()
+
+    @property
+    def arequests(self):
+        """An async HTTP client (``httpx.AsyncClient``) that is connected to the ASGI app.
+
+        Usage: ``r = await api.arequests.get("/")``
+        """
+        # Rebuilt once closed, e.g. by ``async with api.arequests:``.
+        if self._async_session is None or self._async_session.is_closed:
+            self._async_session = httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=self), base_url="http://;"
+            )
+        return self._async_session
+
     def url_for(self, endpoint, **params):
         # TODO: Absolute_url
         """Given an endpoint, returns a rendered URL for its route.
@@ -365,7 +390,7 @@ class API:
 
         return decorator
 
-    def _parse_request(self, schema, location, key=None, unknown=None):
+    def _parse_request(self, schema, location, key=None, unknown=None, many=False):
         """A decorator for parsing and validating input schema from a specified request location.
         Supports both Pydantic and Marshmallow.
 
@@ -374,6 +399,7 @@ class API:
         :param key: The unique key to use for fetching data from the request (e.g., 'q', 'headers', 'data').
         :param unknown: A value to pass for ``unknown`` when calling the
            marshmallow schema's ``load`` method.
+        :param many: If ``True``, validate a list of objects.
         """
 
         if not key:
@@ -381,6 +407,12 @@ class API:
             if location == "media":
                 key = "data"
 
+        # Marshmallow schemas are costly to build, share one across requests.
+        if isinstance(schema, type) and issubclass(schema, ma.Schema):
+            schema = schema(many=many)
+        elif many:  # pydantic.
+            schema = pd.TypeAdapter(List[schema])
+
         def decorator(f):
             @wraps(f)
             async def wrapper(req, resp, *args, **kwargs):
@@ -396,7 +428,7 @@ class API:
 
         return decorator
 
-    def input(self, schema, location="media", key=None, unknown=None):
+    def input(self, schema, location="media", key=None, unknown=None, many=False):
         """A decorator for validating data from a specified request location against a
            Marshmallow or Pydantic schemas.
 
@@ -405,6 +437,8 @@ class API:
         :param key: The unique key to use for fetching data from the request (e.g., 'q', 'headers', 'data').
         :param unknown: A value to pass for ``unknown`` when calling the
            marshmallow schema's ``load`` method. Defaults to ``marshmallow.EXCLUDE`` for headers and cookies.
+        :param many: If ``True``, the payload is a list of objects and ``data`` is a list of dicts,
+           ready for a bulk insert with ``session.execute(insert(Model), data)``.
 
            Pydantic and Marshmallow schemas.
 
@@ -433,7 +467,9 @@ class API:
             r = api.requests.post("http://;/create", json={"price": 9.99, "title": "Pydantic book"})
         """
 
-        return self._parse_request(schema, location=location, key=key, unknown=unknown)
+        return self._parse_request(
+            schema, location=location, key=key, unknown=unknown, many=many
+        )
 
     def output(self, schema, status_code=200, headers=None):
         """A decorator for serializing response dictionaries or SQLAlchemy objects.
@@ -485,6 +521,16 @@ class API:
                 resp.obj = item
         """
 
+        if hasattr(schema, "from_orm"):  # pydantic.
+            # Build the serializers once, rather than validating row by row.
+            adapter = pd.TypeAdapter(schema)
+            many_adapter = pd.TypeAdapter(List[schema])
+            fields = _output_fields(schema)
+        else:  # marshmallow, schemas are costly to build so share them too.
+            dump_schema = schema()
+            dump_many_schema = schema(many=True)
+            fields = _output_fields(dump_schema)
+
         def decorator(f):
             @wraps(f)
             async def wrapper(req, resp, *args, **kwargs):
@@ -494,18 +540,31 @@ class API:
                 if obj is None:
                     raise TypeError("You must set `resp.obj` when using @output")
 
+                if isinstance(obj, Query) and fields is not None:
+                    # Load just the columns the schema reads, rather than ORM objects.
+                    rows = _select_columns(obj, fields)
+                    if rows is not None:
+                        obj = rows
+
                 if isinstance(obj, (DeclarativeBase, Query, list)):
                     if hasattr(schema, "from_orm"):
-                        resp.media = (
-                            [schema.from_orm(o).model_dump() for o in obj]
-                            if isinstance(obj, (Query, list))
-                            else schema.from_orm(obj).model_dump()
-                        )
+                        if isinstance(obj, (Query, list)):
+                            obj_adapter, obj = many_adapter, list(obj)
+                        else:
+                            obj_adapter = adapter
+                        obj = obj_adapter.validate_python(obj, from_attributes=True)
+
+                        if _negotiates_json(req, resp):
+                            # Let pydantic-core write the JSON, no dicts in between.
+                            resp.content = obj_adapter.dump_json(obj)
+                            resp.mimetype = "application/json"
+                        else:
+                            resp.media = obj_adapter.dump_python(obj)
                     else:
                         resp.media = (
-                            schema(many=True).dump(obj)
+                            dump_many_schema.dump(obj)
                             if isinstance(obj, (Query, list))
-                            else schema().dump(obj)
+                            else dump_schema.dump(obj)
                         )
                 elif isinstance(obj, dict):
                     resp.media = obj
@@ -554,3 +613,68 @@ class API:
 
     async def __call__(self, scope, receive, send):
         await self.app(scope, receive, send)
+
+
+def _negotiates_json(req, resp):
+    """Whether ``resp.media`` would be rendered as JSON for this request, see
+    ``Response.body``."""
+    return req.accepts("json") or not any(req.accepts(f) for f in resp.formats)
+
+
+def _output_fields(schema):
+    """The attribute names an output schema (a pydantic model, or a marshmallow
+    schema instance) reads from objects, or ``None`` if they don't map one to one
+    onto attributes (e.g. aliased pydantic fields), or if the schema may need the
+    objects themselves (e.g. validators, method fields or hooks)."""
+    if hasattr(schema, "from_orm"):  # pydantic.
+        if any(field.alias for field in schema.model_fields.values()):
+            return None
+        decorators = schema.__pydantic_decorators__
+        if (
+            decorators.root_validators
+            or decorators.validators
+            or any(
+                decorator.info.mode in ("before", "wrap")
+                for decorator in (
+                    *decorators.model_validators.values(),
+                    *decorators.field_validators.values(),
+                )
+            )
+        ):
+            return None
+        return tuple(schema.model_fields)
+
+    if (
+        any(schema._hooks.values())
+        or type(schema).get_attribute is not ma.Schema.get_attribute
+        or any(
+            isinstance(field, (ma.fields.Method, ma.fields.Function, ma.fields.Nested))
+            for field in schema.dump_fields.values()
+        )
+    ):
+        return None
+    return tuple(field.attribute or name for name, field in schema.dump_fields.items())
+
+
+def _select_columns(query, fields):
+    """Runs ``query`` selecting only the columns named by ``fields``, and returns
+    the rows as dicts. Returns ``None`` when the query isn't for a single mapped
+    entity having all of ``fields`` as columns, or when it also selects from other
+    tables, as ``Query`` only de-duplicates joined rows when loading entities."""
+    descriptions = query.column_descriptions
+    if len(descriptions) != 1:
+        return None
+    entity = descriptions[0]["entity"]
+    if entity is None or descriptions[0]["expr"] is not entity:
+        return None
+
+    mapper = sa_inspect(entity)
+    if query.statement.get_final_froms() != [mapper.local_table]:
+        return None
+
+    columns = mapper.column_attrs
+    if not all(field in columns for field in fields):
+        return None
+
+    query = query.with_entities(*(getattr(entity, field) for field in fields))
+    return [dict(zip(fields, row)) for row in query]
@@ -1,6 +1,6 @@
 import asyncio
 import concurrent.futures
-import multiprocessing
+import os
 import traceback
 
 from starlette.concurrency import run_in_threadpool
@@ -9,18 +9,17 @@ from starlette.concurrency import run_in_threadpool
 class BackgroundQueue:
     def __init__(self, n=None):
         if n is None:
-            n = multiprocessing.cpu_count()
+            # Tasks are mostly I/O bound, allow a few threads per core.
+            n = min(32, (os.cpu_count() or 1) * 4)
 
         self.n = n
         self.pool = concurrent.futures.ThreadPoolExecutor(max_workers=n)
-        self.results = []
+        self.results = []  # Futures of the tasks that haven't finished yet.
 
     def run(self, f, *args, **kwargs):
-        self.pool._max_workers = self.n
-        self.pool._adjust_thread_count()
-
         f = self.pool.submit(f, *args, **kwargs)
         self.results.append(f)
+        f.add_done_callback(self.results.remove)
         return f
 
     def task(self, f):
@@ -39,6 +38,6 @@ class BackgroundQueue:
 
     async def __call__(self, func, *args, **kwargs) -> None:
         if asyncio.iscoroutinefunction(func):
-            return await asyncio.ensure_future(func(*args, **kwargs))
+            return await func(*args, **kwargs)
         else:
             return await run_in_threadpool(func, *args, **kwargs)
@@ -1,8 +1,5 @@
-import json
-from functools import partial
-
 from graphql.error.graphql_error import format_error
-from graphql_server import encode_execution_results, json_encode
+from graphql_server import encode_execution_results
 
 from .templates import GRAPHIQL
 
@@ -59,9 +56,10 @@ class GraphQLView:
             [result],
             is_batch=False,
             format_error=format_error,
-            encode=partial(json_encode, pretty=False),
+            # Keep the result as a dict, the response encodes it for the client.
+            encode=lambda data: data,
         )
-        resp.media = json.loads(result)
+        resp.media = result
         return (query, result, status_code)
 
     async def on_request(self, req, resp):
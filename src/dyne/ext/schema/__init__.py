@@ -1,9 +1,11 @@
+import copy
 from pathlib import Path
 
 from apispec import APISpec, yaml_utils
 from apispec.ext.marshmallow import MarshmallowPlugin
 
 from dyne import status_codes
+from dyne.formats import SafeDumper
 from dyne.statics import DEFAULT_OPENAPI_THEME, OPENAPI_THEMES
 from dyne.templates import Templates
 
@@ -27,6 +29,8 @@ class Schema:
     ):
         self.app = app
         self.schemas = {}
+        self._openapi = None  # (what it's built from, YAML document)
+        self._docs = None  # (what it's built from, HTML page)
         self.title = title
         self.version = version
         self.description = description
@@ -52,7 +56,7 @@ class Schema:
             self.app.add_route(self.docs_route, self.docs_response)
 
         theme_path = (Path(__file__).parent / "docs").resolve()
-        self.templates = Templates(directory=theme_path)
+        self.templates = Templates(directory=theme_path, auto_reload=False)
 
         self.static_route = static_route
 
@@ -93,7 +97,24 @@ class Schema:
 
     @property
     def openapi(self):
-        return self._apispec.to_yaml()
+        # Routes can only be added, so their count tells whether they changed.
+        key = (
+            len(self.app.router.routes),
+            self.title,
+            self.version,
+            self.description,
+            self.terms_of_service,
+            self.contact,
+            self.license,
+            self.openapi_version,
+        )
+        if self._openapi is None or self._openapi[0] != key:
+            self._openapi = (
+                # Copied, so that changes to e.g. the contact dict are noticed.
+                copy.deepcopy(key),
+                self._apispec.to_yaml({"Dumper": SafeDumper}),
+            )
+        return self._openapi[1]
 
     def add_schema(self, name, schema, check_existing=True):
         """Adds a marshmallow schema to the API specification."""
@@ -101,6 +122,7 @@ class Schema:
             assert name not in self.schemas
 
         self.schemas[name] = schema
+        self._openapi = None
 
     def schema(self, name, **options):
         """Decorator for creating new routes around function and class definitions.
@@ -123,12 +145,18 @@ class Schema:
 
     @property
     def docs(self):
-        return self.templates.render(
-            f"{self.docs_theme}.html",
-            title=self.title,
-            version=self.version,
-            schema_url="/schema.yml",
-        )
+        key = (self.docs_theme, self.title, self.version)
+        if self._docs is None or self._docs[0] != key:
+            self._docs = (
+                key,
+                self.templates.render(
+                    f"{self.docs_theme}.html",
+                    title=self.title,
+                    version=self.version,
+                    schema_url="/schema.yml",
+                ),
+            )
+        return self._docs[1]
 
     def static_url(self, asset):
         """Given a static asset, return its URL path."""
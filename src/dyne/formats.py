@@ -1,4 +1,6 @@
+import enum
 import json
+import uuid
 from urllib.parse import urlencode
 
 import yaml
@@ -6,6 +8,17 @@ from requests_toolbelt.multipart import decoder
 
 from .models import QueryDict
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml.
+    from yaml import SafeDumper, SafeLoader
+
 
 async def format_form(r, encode=False):
     if encode:
@@ -33,17 +46,74 @@ async def format_form(r, encode=False):
 async def format_yaml(r, encode=False):
     if encode:
         r.headers.update({"Content-Type": "application/x-yaml"})
-        return yaml.safe_dump(r.media)
+        return yaml.dump(r.media, Dumper=SafeDumper)
     else:
-        return yaml.safe_load(await r.content)
+        return yaml.load(await r.content, Loader=SafeLoader)
+
+
+def _orjson_default(obj):
+    # Subclasses of builtins are passed through here, so that overrides such as
+    # ``QueryDict.items`` are honoured the way ``json.dumps`` honours them.
+    if isinstance(obj, dict):
+        return dict(obj.items())
+    if isinstance(obj, list):
+        return list(obj)
+    if isinstance(obj, str):
+        return str.__str__(obj)
+    if isinstance(obj, int):
+        return int(obj)
+    raise TypeError
+
+
+def _json_default(obj):
+    # orjson encodes these natively, with no option to pass them through, so
+    # encode them the same way when falling back to json.
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if isinstance(obj, enum.Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def dumps(obj):
+    """Encodes ``obj`` to JSON bytes, with orjson when it's installed.
+
+    Either way, ``UUID`` and ``Enum`` values are encoded, while e.g. ``datetime``
+    and dataclass instances raise ``TypeError``. Note that orjson encodes ``NaN``
+    and ``Infinity`` as ``null``.
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(
+                obj,
+                default=_orjson_default,
+                # Types json can't encode go to the default, and fail alike.
+                option=orjson.OPT_PASSTHROUGH_SUBCLASS
+                | orjson.OPT_PASSTHROUGH_DATETIME
+                | orjson.OPT_PASSTHROUGH_DATACLASS
+                | orjson.OPT_NON_STR_KEYS,
+            )
+        except TypeError:  # e.g. integers over 64 bits, let json decide.
+            pass
+    return json.dumps(obj, default=_json_default).encode("utf-8")
+
+
+def loads(content):
+    """Decodes JSON ``content``, with orjson when it's installed."""
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:  # e.g. UTF-16 or NaN, let json decide.
+            pass
+    return json.loads(content)
 
 
 async def format_json(r, encode=False):
     if encode:
         r.headers.update({"Content-Type": "application/json"})
-        return json.dumps(r.media)
+        return dumps(r.media)
     else:
-        return json.loads(await r.content)
+        return loads(await r.content)
 
 
 async def format_files(r, encode=False):
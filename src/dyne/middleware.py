@@ -0,0 +1,40 @@
+from starlette.datastructures import URL, Headers
+from starlette.middleware.trustedhost import (
+    TrustedHostMiddleware as StarletteTrustedHostMiddleware,
+)
+from starlette.responses import PlainTextResponse, RedirectResponse
+
+
+class TrustedHostMiddleware(StarletteTrustedHostMiddleware):
+    """Starlette's ``TrustedHostMiddleware``, with ``allowed_hosts`` split once
+    into a set of exact hosts and a tuple of wildcard suffixes, instead of
+    being scanned pattern by pattern on every request.
+    """
+
+    def __init__(self, app, allowed_hosts=None, www_redirect=True):
+        super().__init__(app, allowed_hosts=allowed_hosts, www_redirect=www_redirect)
+        self.exact_hosts = frozenset(
+            host for host in self.allowed_hosts if not host.startswith("*")
+        )
+        # "*.example.com" -> ".example.com"
+        self.suffix_hosts = tuple(
+            host[1:] for host in self.allowed_hosts if host.startswith("*.")
+        )
+
+    async def __call__(self, scope, receive, send):
+        if self.allow_any or scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        host = Headers(scope=scope).get("host", "").split(":")[0]
+        if host in self.exact_hosts or host.endswith(self.suffix_hosts):
+            await self.app(scope, receive, send)
+            return
+
+        if self.www_redirect and "www." + host in self.exact_hosts:
+            url = URL(scope=scope)
+            redirect_url = url.replace(netloc="www." + url.netloc)
+            response = RedirectResponse(url=str(redirect_url))
+        else:
+            response = PlainTextResponse("Invalid host header", status_code=400)
+        await response(scope, receive, send)
@@ -1,3 +1,4 @@
+import codecs
 import functools
 import inspect
 from http.cookies import SimpleCookie
@@ -14,9 +15,19 @@ from starlette.requests import State
 from starlette.responses import Response as StarletteResponse
 from starlette.responses import StreamingResponse as StarletteStreamingResponse
 
-from .statics import DEFAULT_ENCODING
+from .statics import DEFAULT_ENCODING, STREAM_BUFFER_SIZE
 from .status_codes import HTTP_301
 
+_BODYLESS_METHODS = frozenset(("GET", "HEAD", "DELETE", "OPTIONS"))
+
+# Byte order marks of JSON bodies pydantic can't parse, json.loads detects them.
+_JSON_BOMS = (
+    codecs.BOM_UTF8,
+    codecs.BOM_UTF16_LE,
+    codecs.BOM_UTF16_BE,
+    codecs.BOM_UTF32_BE,  # UTF-32-LE starts like UTF-16-LE.
+)
+
 
 class QueryDict(dict):
     def __init__(self, query_string):
@@ -107,6 +118,7 @@ class Request:
         "_content",
         "_data",
         "_cookies",
+        "_params",
     ]
 
     def __init__(self, scope, receive, api=None, formats=None):
@@ -123,6 +135,7 @@ class Request:
 
         self._headers = headers
         self._cookies = None
+        self._params = None
 
     @property
     def session(self):
@@ -171,10 +184,10 @@ class Request:
     @property
     def params(self):
         """A dictionary of the parsed query parameters used for the Request."""
-        try:
-            return QueryDict(self.url.query)
-        except AttributeError:
-            return QueryDict({})
+        if self._params is None:
+            query_string = self._starlette.scope.get("query_string", b"")
+            self._params = QueryDict(query_string.decode())
+        return self._params
 
     @property
     def state(self) -> State:
@@ -205,10 +218,22 @@ class Request:
     @property
     async def content(self):
         """The Request body, as bytes. Must be awaited."""
-        if not self._content:
-            self._content = await self._starlette.body()
+        if self._content is None:
+            if self._has_no_body():
+                self._content = b""
+            else:
+                self._content = await self._starlette.body()
         return self._content
 
+    def _has_no_body(self):
+        # A GET/HEAD/DELETE/OPTIONS request with neither a Content-Length nor a
+        # Transfer-Encoding header carries no body, so there's nothing to receive.
+        return (
+            self._starlette.scope["method"] in _BODYLESS_METHODS
+            and "content-length" not in self._headers
+            and "transfer-encoding" not in self._headers
+        )
+
     @property
     async def text(self):
         """The Request body, as unicode. Must be awaited."""
@@ -244,24 +269,44 @@ class Request:
         """
 
         if format is None:
-            format = "yaml" if "yaml" in self.mimetype or "" else "json"
-            format = "form" if "form" in self.mimetype or "" else format
+            format = self._media_format()
 
         if format in self.formats:
             return await self.formats[format](self)
         else:
             return await format(self)
 
+    def _media_format(self):
+        if "form" in self.mimetype:
+            return "form"
+        if "yaml" in self.mimetype:
+            return "yaml"
+        return "json"
+
     async def validate(self, schema, location="media", unknown=None):
         """Validates data from a specified request location against a
            Marshmallow or Pydantic schemas.
 
-        :param model: Marshmallow or Pydantic schemas.
+        :param model: Marshmallow or Pydantic schemas, a Marshmallow schema instance or a Pydantic ``TypeAdapter``.
         :param location: headers, params or media
         :param unknown: A value to pass for ``unknown`` when calling the
            marshmallow schema's ``load`` method. Defaults to ``marshmallow.EXCLUDE`` for headers and cookies.
         """
 
+        # Pydantic validates JSON bodies straight from the raw bytes.
+        is_pydantic = isinstance(schema, pd.TypeAdapter) or (
+            isinstance(schema, type) and issubclass(schema, pd.BaseModel)
+        )
+        from_json = (
+            is_pydantic and location == "media" and self._media_format() == "json"
+        )
+        content = None
+        if from_json:
+            content = await self.content
+            # Pydantic only reads UTF-8, leave UTF-16/32 bodies to ``self.media()``.
+            if content.startswith(_JSON_BOMS) or b"\x00" in content[:4]:
+                from_json = False
+
         data = (
             self.headers
             if location == "headers"
@@ -271,7 +316,7 @@ class Request:
                 else (
                     self.params.normalize()
                     if location in ["params", "query"]
-                    else await self.media()
+                    else (content if from_json else await self.media())
                 )
             )
         )
@@ -280,22 +325,106 @@ class Request:
             unknown = ma.EXCLUDE
 
         try:
-            if issubclass(schema, ma.Schema):  # marshmallow.
+            if isinstance(schema, ma.Schema):  # marshmallow, already instantiated.
+                self._data = schema.load(data, unknown=unknown)
+            elif isinstance(schema, pd.TypeAdapter):  # pydantic, e.g. List[Model].
+                self._data = schema.dump_python(
+                    schema.validate_json(data)
+                    if from_json
+                    else schema.validate_python(data)
+                )
+            elif issubclass(schema, ma.Schema):  # marshmallow.
                 self._data = schema().load(data, unknown=unknown)
             elif issubclass(schema, pd.BaseModel):  # pydantic.
-                self._data = schema(**data).model_dump()
+                self._data = (
+                    schema.model_validate_json(data)
+                    if from_json
+                    else schema.model_validate(data)
+                ).model_dump()
             else:
                 self._data = dict(errors=f"Unsupported schema type {schema.__name__}")
         except (ma.ValidationError, pd.ValidationError) as e:
-            self._data = {
-                "errors": (
-                    e.errors() if isinstance(e, pd.ValidationError) else e.messages
-                )
-            }
+            errors = e.errors() if isinstance(e, pd.ValidationError) else e.messages
+            if from_json:  # Malformed JSON reports the raw body as its input.
+                for error in errors:
+                    if isinstance(error.get("input"), bytes):
+                        error["input"] = error["input"].decode(errors="replace")
+            self._data = {"errors": errors}
 
         return self._data
 
 
+class _Resume:
+    """Finishes awaiting ``step``, a coroutine-like object that has already been
+    started by hand and yielded ``pending`` instead of completing."""
+
+    __slots__ = ("step", "pending")
+
+    def __init__(self, step, pending):
+        self.step = step
+        self.pending = pending
+
+    def __await__(self):
+        step, pending = self.step, self.pending
+        while True:
+            try:
+                sent = yield pending
+            except GeneratorExit:
+                step.close()
+                raise
+            except BaseException as exc:
+                try:
+                    pending = step.throw(exc)
+                except StopIteration as e:
+                    return e.value
+            else:
+                try:
+                    pending = step.send(sent)
+                except StopIteration as e:
+                    return e.value
+
+
+async def coalesce_stream(chunks, charset, limit=STREAM_BUFFER_SIZE):
+    """Merges the chunks of an async generator that are produced without it
+    suspending, so they are sent as a single ASGI message. Whatever is buffered is
+    flushed before waiting on the generator, so slow streams aren't held back."""
+    buffer = bytearray()
+    while True:
+        step = chunks.__anext__()
+        try:
+            pending = step.send(None)
+        except StopIteration as e:  # Produced without suspending.
+            chunk = e.value
+        except StopAsyncIteration:
+            break
+        else:
+            if buffer:
+                try:
+                    yield bytes(buffer)
+                except BaseException as exc:
+                    # Closed while the generator is mid-step, unwind it as well.
+                    try:
+                        step.throw(exc)
+                    except BaseException:
+                        pass
+                    else:
+                        step.close()
+                    raise
+                buffer.clear()
+            try:
+                chunk = await _Resume(step, pending)
+            except StopAsyncIteration:
+                break
+
+        buffer += chunk.encode(charset) if isinstance(chunk, str) else chunk
+        if len(buffer) >= limit:
+            yield bytes(buffer)
+            buffer.clear()
+
+    if buffer:
+        yield bytes(buffer)
+
+
 def content_setter(mimetype):
     def getter(instance):
         return instance.content
@@ -421,6 +550,7 @@ class Response:
 
         if self._stream is not None:
             response_cls = StarletteStreamingResponse
+            body = coalesce_stream(body, response_cls.charset)
         else:
             response_cls = StarletteResponse
 
@@ -1,6 +1,8 @@
 import asyncio
+import functools
 import inspect
 import re
+import sys
 import traceback
 from collections import defaultdict
 
@@ -17,12 +19,21 @@ _CONVERTORS = {
     "int": (int, r"\d+"),
     "str": (str, r"[^/]+"),
     "float": (float, r"\d+(.\d+)?"),
+    "path": (str, r".*"),
+}
+
+_CONVERTOR_RES = {name: re.compile(regex) for name, (_, regex) in _CONVERTORS.items()}
+
+# Interned ``on_<method>`` names of class-based views, keyed by request method.
+_VIEW_NAMES = {
+    method: sys.intern(f"on_{method.lower()}")
+    for method in ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS")
 }
 
 PARAM_RE = re.compile("{([a-zA-Z_][a-zA-Z0-9_]*)(:[a-zA-Z_][a-zA-Z0-9_]*)?}")
 
 
-def compile_path(path):
+def compile_path(path, group_prefix=""):
     path_re = "^"
     param_convertors = {}
     idx = 0
@@ -36,7 +47,7 @@ def compile_path(path):
         convertor, convertor_re = _CONVERTORS[convertor_type]
 
         path_re += path[idx : match.start()]
-        path_re += rf"(?P<{param_name}>{convertor_re})"
+        path_re += rf"(?P<{group_prefix}{param_name}>{convertor_re})"
 
         param_convertors[param_name] = convertor
 
@@ -47,13 +58,97 @@ def compile_path(path):
     return re.compile(path_re), param_convertors
 
 
+def compile_param_extractor(param_convertors):
+    """Generates a function converting the raw values captured for a route, in
+    order, into its path params, e.g. for ``/{greeting}/{id:int}``::
+
+        def path_params(values):
+            return {"greeting": values[0], "id": _c1(values[1])}
+    """
+    namespace = {}
+    items = []
+    for idx, (name, convertor) in enumerate(param_convertors.items()):
+        value = f"values[{idx}]"
+        if convertor is not str:  # Captured values are already strings.
+            namespace[f"_c{idx}"] = convertor
+            value = f"_c{idx}({value})"
+        items.append(f"{name!r}: {value}")
+
+    source = f"def path_params(values):\n    return {{{', '.join(items)}}}\n"
+    exec(source, namespace)
+    return namespace["path_params"]
+
+
+def is_async_view(view):
+    # "Monckey patch" for graphql: explicitly checking __call__
+    return asyncio.iscoroutinefunction(view) or asyncio.iscoroutinefunction(
+        getattr(view, "__call__", None)
+    )
+
+
+def split_path(path):
+    """Splits a route into the segments stored in the route trie.
+
+    Each segment is a ``(kind, value)`` pair, where ``kind`` is one of ``"static"``,
+    ``"param"`` or ``"wildcard"``. Returns ``None`` when the route can only be
+    matched by its regex, e.g. a segment mixing text and parameters.
+    """
+    parts = path.split("/")[1:]
+    segments = []
+
+    for idx, part in enumerate(parts):
+        match = PARAM_RE.fullmatch(part)
+        if match is None:
+            if PARAM_RE.search(part):
+                return None
+            segments.append(("static", part))
+            continue
+
+        convertor_type = (match.group(2) or ":str").lstrip(":")
+        if convertor_type == "path":
+            if idx != len(parts) - 1:
+                return None
+            segments.append(("wildcard", None))
+        else:
+            segments.append(("param", convertor_type))
+
+    return segments
+
+
 class BaseRoute:
+    def _compile(self, route, endpoint):
+        """Precomputes what matching, ``url_for`` and comparisons need."""
+        self.path_re, self.param_convertors = compile_path(route)
+        self.path_params = compile_param_extractor(self.param_convertors)
+        self._url_template = PARAM_RE.sub(r"{\1}", route)
+
+        # Endpoints may be callable instances (e.g. GraphQLView) without a __name__.
+        self.endpoint_name = getattr(endpoint, "__name__", type(endpoint).__name__)
+        self.description = endpoint.__doc__
+        self._repr = f"<Route {route!r}={endpoint!r}>"
+        self._key = (route, endpoint)
+
+    def __repr__(self):
+        return self._repr
+
     def matches(self, scope):
         raise NotImplementedError()
 
+    def url(self, **params):
+        return self._url_template.format_map(params)
+
     async def __call__(self, scope, receive, send):
         raise NotImplementedError()
 
+    def __eq__(self, other):
+        # [TODO] compare to str ?
+        if not isinstance(other, type(self)):
+            return NotImplemented
+        return self._key == other._key
+
+    def __hash__(self):
+        return hash(self._key)
+
 
 class Route(BaseRoute):
     def __init__(self, route, endpoint, *, before_request=False, methods=("GET",)):
@@ -62,22 +157,26 @@ class Route(BaseRoute):
         self.endpoint = endpoint
         self.before_request = before_request
         self.methods = methods
-
-        self.path_re, self.param_convertors = compile_path(route)
-
-    def __repr__(self):
-        return f"<Route {self.route!r}={self.endpoint!r}>"
-
-    def url(self, **params):
-        return self.route.format(**params)
-
-    @property
-    def endpoint_name(self):
-        return self.endpoint.__name__
-
-    @property
-    def description(self):
-        return self.endpoint.__doc__
+        self._methods = frozenset(method.upper() for method in methods)
+
+        self._compile(route, endpoint)
+
+        # For class-based endpoints, the views to run for each request method, as
+        # (name, is_async) pairs.
+        self._class_views = None
+        if inspect.isclass(endpoint):
+            self._class_views = {
+                method: self._view_names(view_name)
+                for method, view_name in _VIEW_NAMES.items()
+            }
+        self._is_async = is_async_view(endpoint)
+
+    def _view_names(self, view_name):
+        return tuple(
+            (name, is_async_view(getattr(self.endpoint, name)))
+            for name in ("on_request", view_name)
+            if hasattr(self.endpoint, name)
+        )
 
     def matches(self, scope):
         if scope["type"] != "http":
@@ -108,31 +207,25 @@ class Route(BaseRoute):
             else:
                 await run_in_threadpool(before_request, request, response)
 
-        views = []
+        if self._class_views is not None:
+            method = scope["method"]
+            view_names = self._class_views.get(method)
+            if view_names is None:
+                view_names = self._view_names(f"on_{method.lower()}")
+            if not view_names:
+                raise HTTPException(status_code=status_codes.HTTP_405)
 
-        if inspect.isclass(self.endpoint):
             endpoint = self.endpoint()
-            on_request = getattr(endpoint, "on_request", None)
-            if on_request:
-                views.append(on_request)
-
-            method_name = f"on_{request.method}"
-            try:
-                view = getattr(endpoint, method_name)
-                views.append(view)
-            except AttributeError:
-                if on_request is None:
-                    raise HTTPException(status_code=status_codes.HTTP_405)
+            views = [
+                (getattr(endpoint, name), is_async) for name, is_async in view_names
+            ]
         else:
-            if request.method not in [method.lower() for method in self.methods]:
+            if scope["method"] not in self._methods:
                 raise HTTPException(status_code=status_codes.HTTP_405) from None
-            views.append(self.endpoint)
+            views = [(self.endpoint, self._is_async)]
 
-        for view in views:
-            # "Monckey patch" for graphql: explicitly checking __call__
-            if asyncio.iscoroutinefunction(view) or asyncio.iscoroutinefunction(
-                view.__call__
-            ):
+        for view, is_async in views:
+            if is_async:
                 await view(request, response, **path_params)
             else:
                 await run_in_threadpool(view, request, response, **path_params)
@@ -142,13 +235,6 @@ class Route(BaseRoute):
 
         await response(scope, receive, send)
 
-    def __eq__(self, other):
-        # [TODO] compare to str ?
-        return self.route == other.route and self.endpoint == other.endpoint
-
-    def __hash__(self):
-        return hash(self.route) ^ hash(self.endpoint) ^ hash(self.before_request)
-
 
 class WebSocketRoute(BaseRoute):
     def __init__(self, route, endpoint, *, before_request=False):
@@ -157,21 +243,7 @@ class WebSocketRoute(BaseRoute):
         self.endpoint = endpoint
         self.before_request = before_request
 
-        self.path_re, self.param_convertors = compile_path(route)
-
-    def __repr__(self):
-        return f"<Route {self.route!r}={self.endpoint!r}>"
-
-    def url(self, **params):
-        return self.route.format(**params)
-
-    @property
-    def endpoint_name(self):
-        return self.endpoint.__name__
-
-    @property
-    def description(self):
-        return self.endpoint.__doc__
+        self._compile(route, endpoint)
 
     def matches(self, scope):
         if scope["type"] != "websocket":
@@ -198,17 +270,124 @@ class WebSocketRoute(BaseRoute):
 
         await self.endpoint(ws)
 
-    def __eq__(self, other):
-        # [TODO] compare to str ?
-        return self.route == other.route and self.endpoint == other.endpoint
 
-    def __hash__(self):
-        return hash(self.route) ^ hash(self.endpoint) ^ hash(self.before_request)
+class TrieNode:
+    """A node of the route trie, one level per ``/``-separated path segment.
+
+    Children are looked up by exact segment first (``static``), then by path
+    convertor (``params``), then by a trailing ``{name:path}`` (``wildcard``).
+    """
+
+    __slots__ = ("static", "params", "wildcard", "handlers", "websocket")
+
+    def __init__(self):
+        self.static = {}
+        self.params = {}
+        self.wildcard = None
+        self.handlers = {}  # HTTP method, or "*" for class-based views -> Route
+        self.websocket = None
+
+    def insert(self, segments):
+        node = self
+        for kind, value in segments:
+            if kind == "static":
+                node = node.static.setdefault(value, TrieNode())
+            elif kind == "param":
+                if value not in node.params:
+                    node.params[value] = (_CONVERTOR_RES[value], TrieNode())
+                node = node.params[value][1]
+            else:
+                if node.wildcard is None:
+                    node.wildcard = TrieNode()
+                node = node.wildcard
+        return node
+
+    def accepts(self, websocket):
+        return self.websocket is not None if websocket else bool(self.handlers)
+
+    def find(self, parts, idx, values, websocket):
+        """Returns the node matching ``parts[idx:]``, appending captured segments to
+        ``values``. Static segments take precedence over parameters."""
+        if idx == len(parts):
+            return self if self.accepts(websocket) else None
+
+        part = parts[idx]
+        child = self.static.get(part)
+        if child is not None:
+            node = child.find(parts, idx + 1, values, websocket)
+            if node is not None:
+                return node
+
+        if part:
+            for regex, child in self.params.values():
+                if regex.fullmatch(part) is None:
+                    continue
+                values.append(part)
+                node = child.find(parts, idx + 1, values, websocket)
+                if node is not None:
+                    return node
+                values.pop()
+
+        if self.wildcard is not None and self.wildcard.accepts(websocket):
+            values.append("/".join(parts[idx:]))
+            return self.wildcard
+
+        return None
+
+    def compile(self):
+        """Flattens the trie into a table of ``(static, params, wildcard, node)``
+        rows, where children are referenced by their row index."""
+        table = []
+
+        def visit(node):
+            idx = len(table)
+            table.append(None)
+            static = {part: visit(child) for part, child in node.static.items()}
+            params = tuple(
+                (regex.fullmatch, visit(child)) for regex, child in node.params.values()
+            )
+            wildcard = None if node.wildcard is None else visit(node.wildcard)
+            table[idx] = (static, params, wildcard, node)
+            return idx
+
+        visit(self)
+        return table
+
+
+def walk_table(table, parts, values):
+    """Follows the preferred edge for each segment through a compiled trie, without
+    backtracking. Returns ``None`` if the walk gets stuck."""
+    static, params, wildcard, node = table[0]
+    for idx, part in enumerate(parts):
+        child = static.get(part)
+        if child is None:
+            for fullmatch, child in params:
+                if fullmatch(part) is not None:
+                    values.append(part)
+                    break
+            else:
+                if wildcard is None:
+                    return None
+                values.append("/".join(parts[idx:]))
+                return table[wildcard][3]
+        static, params, wildcard, node = table[child]
+    return node
 
 
 class Router:
     def __init__(self, routes=None, default_response=None, before_requests=None):
-        self.routes = [] if routes is None else list(routes)
+        self.routes = []
+        self._paths = set()  # registered route paths, for duplicate checks
+        self._trie = TrieNode()
+        self._table = None  # compiled from the trie on the first lookup
+        self._static_routes = {}  # path -> trie node, for routes without params
+        # Routes the trie can't represent, matched by regex in registration order.
+        self._regex_routes = []
+        self._regex_union = None  # scope type -> (pattern, routes), built lazily
+        self._order = {}  # route -> registration index, for precedence
+        self._cached_url_for = functools.lru_cache(maxsize=1024)(self._url_for)
+        for route in routes or ():
+            self._register(route)
         # [TODO] Make its own router
         self.apps = {}
         self.default_endpoint = (
@@ -244,9 +423,7 @@ class Router:
             return
 
         if check_existing:
-            assert not self.routes or route not in (
-                item.route for item in self.routes
-            ), f"Route '{route}' already exists"
+            assert route not in self._paths, f"Route '{route}' already exists"
 
         if default:
             self.default_endpoint = endpoint
@@ -256,11 +433,38 @@ class Router:
         else:
             route = Route(route, endpoint, methods=methods)
 
+        self._register(route)
+
+    def _register(self, route):
+        self._order.setdefault(route, len(self.routes))
         self.routes.append(route)
+        self._paths.add(route.route)
+        self._cached_url_for.cache_clear()
+
+        segments = split_path(route.route)
+        if segments is None:
+            self._regex_routes.append(route)
+            self._regex_union = None
+            return
+
+        self._table = None
+        node = self._trie.insert(segments)
+        if all(kind == "static" for kind, _ in segments):
+            self._static_routes[route.route] = node
+        if isinstance(route, WebSocketRoute):
+            if node.websocket is None:
+                node.websocket = route
+        elif inspect.isclass(route.endpoint):
+            node.handlers.setdefault("*", route)
+        else:
+            for method in route.methods:
+                node.handlers.setdefault(method.upper(), route)
 
     def mount(self, route, app):
         """Mounts ASGI / WSGI applications at a given route"""
-        self.apps.update(route, app)
+        if not is_async_view(app):  # A WSGI app.
+            app = WSGIMiddleware(app)
+        self.apps[route] = app
 
     def add_event_handler(self, event_type, handler):
         assert event_type in (
@@ -284,9 +488,19 @@ class Router:
 
     def url_for(self, endpoint, **params):
         # TODO: Check for params
+        # Keyed on value types too, as 1, 1.0 and True hash the same.
+        params = tuple((k, type(v), v) for k, v in params.items())
+        try:
+            key = frozenset(params)
+            hash(endpoint)
+        except TypeError:  # Unhashable endpoint or params, skip the cache.
+            return self._url_for(endpoint, params)
+        return self._cached_url_for(endpoint, key)
+
+    def _url_for(self, endpoint, params):
         for route in self.routes:
-            if endpoint in (route.endpoint, route.endpoint.__name__):
-                return route.url(**params)
+            if endpoint in (route.endpoint, route.endpoint_name):
+                return route.url(**{k: v for k, _, v in params})
         return None
 
     async def default_response(self, scope, receive, send):
@@ -297,13 +511,115 @@ class Router:
 
         raise HTTPException(status_code=status_codes.HTTP_404)
 
+    def _find_node(self, scope):
+        websocket = scope["type"] == "websocket"
+        path = scope["path"]
+
+        # The trie prefers static segments, so an exact hit is what it would find.
+        node = self._static_routes.get(path)
+        if node is not None and node.accepts(websocket):
+            return node, []
+
+        if self._table is None:
+            self._table = self._trie.compile()
+
+        parts = path.split("/")[1:]
+        values = []
+        node = walk_table(self._table, parts, values)
+        if node is not None and node.accepts(websocket):
+            return node, values
+
+        # The preferred path was a dead end, backtrack through the trie.
+        values = []
+        node = self._trie.find(parts, 0, values, websocket)
+        return node, values
+
+    def _compile_regex_routes(self):
+        """Joins the regex of every route the trie can't represent into a single
+        alternation per scope type, so they're all tried in one ``match`` call."""
+        union = {}
+        for scope_type, route_cls in (("http", Route), ("websocket", WebSocketRoute)):
+            routes = [r for r in self._regex_routes if isinstance(r, route_cls)]
+            if not routes:
+                continue
+            pattern = "|".join(
+                f"(?P<r{idx}>{compile_path(route.route, f'r{idx}_')[0].pattern})"
+                for idx, route in enumerate(routes)
+            )
+            union[scope_type] = (re.compile(pattern), routes)
+        return union
+
+    def _match_regex(self, scope):
+        """Returns the regex-only route matching the scope and its path params."""
+        if self._regex_union is None:
+            self._regex_union = self._compile_regex_routes()
+
+        compiled = self._regex_union.get(scope["type"])
+        if compiled is None:
+            return None, None
+        pattern, routes = compiled
+
+        match = pattern.match(scope["path"])
+        if match is None:
+            return None, None
+
+        prefix = match.lastgroup
+        route = routes[int(prefix[1:])]
+        values = [match.group(f"{prefix}_{name}") for name in route.param_convertors]
+        return route, route.path_params(values)
+
+    def _match_earlier_regex(self, scope, route):
+        """Returns the regex-only route matching the scope and its path params, if
+        it was registered before ``route``, which the trie matched."""
+        if not self._regex_routes:
+            return None, None
+        order = self._order[route]
+        if self._order[self._regex_routes[0]] > order:
+            return None, None
+
+        regex_route, path_params = self._match_regex(scope)
+        if regex_route is None or self._order[regex_route] > order:
+            return None, None
+        return regex_route, path_params
+
+    def match(self, scope):
+        """Returns the first route whose path matches the scope, regardless of the
+        request method."""
+        node, _ = self._find_node(scope)
+        if node is not None:
+            if scope["type"] == "websocket":
+                route = node.websocket
+            else:
+                route = next(iter(node.handlers.values()))
+            regex_route, _ = self._match_earlier_regex(scope, route)
+            return route if regex_route is None else regex_route
+
+        route, _ = self._match_regex(scope)
+        return route
+
     def _resolve_route(self, scope):
-        for route in self.routes:
-            matches, child_scope = route.matches(scope)
-            if matches:
-                scope.update(child_scope)
-                return route
-        return None
+        node, values = self._find_node(scope)
+        if node is not None:
+            if scope["type"] == "websocket":
+                route = node.websocket
+            else:
+                route = node.handlers.get(scope["method"]) or node.handlers.get("*")
+                if route is None:
+                    # Let the route reject the method, after the before_request hooks.
+                    route = next(iter(node.handlers.values()))
+
+            regex_route, path_params = self._match_earlier_regex(scope, route)
+            if regex_route is not None:
+                scope["path_params"] = path_params
+                return regex_route
+
+            scope["path_params"] = route.path_params(values)
+            return route
+
+        route, path_params = self._match_regex(scope)
+        if route is not None:
+            scope["path_params"] = path_params
+        return route
 
     async def lifespan(self, scope, receive, send):
         message = await receive()
@@ -346,12 +662,7 @@ class Router:
             if path.startswith(path_prefix):
                 scope["path"] = path[len(path_prefix) :]
                 scope["root_path"] = root_path + path_prefix
-                try:
-                    await app(scope, receive, send)
-                    return
-                except TypeError:
-                    app = WSGIMiddleware(app)
-                    await app(scope, receive, send)
-                    return
+                await app(scope, receive, send)
+                return
 
         await self.default_endpoint(scope, receive, send)
@@ -3,6 +3,7 @@ DEFAULT_ENCODING = "utf-8"
 DEFAULT_OPENAPI_THEME = "elements"
 DEFAULT_SESSION_COOKIE = "Dyne-Session"
 DEFAULT_SECRET_KEY = "NOTASECRET"
+STREAM_BUFFER_SIZE = 16 * 1024
 
 DEFAULT_CORS_PARAMS = {
     "allow_origins": (),
@@ -1,20 +1,37 @@
+import functools
 from contextlib import contextmanager
 
 import jinja2
 
 
 class Templates:
+    """Renders `jinja2 <http://jinja.pocoo.org/docs/>`_ templates from ``directory``.
+
+    :param auto_reload: If ``True``, template files are checked for changes on every render.
+    :param bytecode_cache: A ``jinja2.BytecodeCache``, to share compiled templates across processes.
+    """
+
     def __init__(
-        self, directory="templates", autoescape=True, context=None, enable_async=False
+        self,
+        directory="templates",
+        autoescape=True,
+        context=None,
+        enable_async=False,
+        auto_reload=True,
+        bytecode_cache=None,
     ):
         self.directory = directory
         self._env = jinja2.Environment(
             loader=jinja2.FileSystemLoader([str(self.directory)]),
             autoescape=autoescape,
             enable_async=enable_async,
+            auto_reload=auto_reload,
+            bytecode_cache=bytecode_cache,
         )
         self.default_context = {} if context is None else {**context}
         self._env.globals.update(self.default_context)
+        # Unlike files, template strings aren't cached by jinja2.
+        self._from_string = functools.lru_cache(maxsize=128)(self._env.from_string)
 
     @property
     def context(self):
@@ -23,6 +40,7 @@ class Templates:
     @context.setter
     def context(self, context):
         self._env.globals = {**self.default_context, **context}
+        self._from_string.cache_clear()
 
     def get_template(self, name):
         return self._env.get_template(name)
@@ -55,5 +73,5 @@ class Templates:
         :param *args, **kwargs: Data to pass into the template.
         :param **kwargs: Data to pass into the template.
         """
-        template = self._env.from_string(source)
+        template = self._from_string(source)
         return template.render(*args, **kwargs)
@@ -0,0 +1,69 @@
+import threading
+import weakref
+from concurrent.futures import Future
+from contextlib import contextmanager
+
+import anyio
+from anyio.from_thread import BlockingPortal
+from starlette.testclient import TestClient as StarletteTestClient
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+
+class TestClient(StarletteTestClient):
+    """Starlette's ``TestClient``, running the app on a single long-lived event loop.
+
+    Outside of a ``with client:`` block, Starlette starts a new thread and event
+    loop for every request. This client starts one, in a daemon thread, on the
+    first request and keeps using it until the client is garbage collected.
+    The loop runs on uvloop when it's installed, as it does under uvicorn.
+    """
+
+    _loop_portal = None
+
+    @contextmanager
+    def _portal_factory(self):
+        if self.portal is not None:  # Inside `with client:`, use its loop.
+            yield self.portal
+            return
+
+        if self._loop_portal is None:
+            backend_options = self.async_backend["backend_options"]
+            if self.async_backend["backend"] == "asyncio" and not backend_options:
+                backend_options = {"use_uvloop": uvloop is not None}
+            self._loop_portal = _start_portal(
+                self.async_backend["backend"], backend_options
+            )
+            weakref.finalize(self, _stop_portal, self._loop_portal)
+        yield self._loop_portal
+
+
+def _start_portal(backend, backend_options):
+    """Runs an event loop in a daemon thread, returning a portal into it."""
+    future = Future()
+
+    async def serve():
+        async with BlockingPortal() as portal:
+            future.set_result(portal)
+            await portal.sleep_until_stopped()
+
+    def run():
+        try:
+            anyio.run(serve, backend=backend, backend_options=backend_options)
+        except BaseException as e:
+            if not future.done():
+                future.set_exception(e)
+            raise
+
+    threading.Thread(target=run, name="dyne-testclient", daemon=True).start()
+    return future.result()
+
+
+def _stop_portal(portal):
+    try:
+        portal.start_task_soon(portal.stop)
+    except RuntimeError:  # The loop has already stopped.
+        pass
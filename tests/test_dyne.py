@@ -1,15 +1,22 @@
+import asyncio
 import io
-import os
-import random
-import string
+import secrets
 
+import jinja2
 import pytest
 import yaml
-from marshmallow import Schema, fields
-from pydantic import BaseModel, ConfigDict
-from sqlalchemy import Column, Float, Integer, String, create_engine
-from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from marshmallow import Schema, fields, pre_dump
+from pydantic import BaseModel, ConfigDict, model_validator
+from sqlalchemy import Column, Float, ForeignKey, Integer, String, create_engine
+from sqlalchemy.orm import (
+    DeclarativeBase,
+    relationship,
+    scoped_session,
+    sessionmaker,
+)
+from sqlalchemy.pool import StaticPool
 from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse
 from starlette.testclient import TestClient as StarletteTestClient
 
 import dyne
@@ -36,6 +43,17 @@ def test_route_repr():
     assert route.description == home.__doc__
 
 
+def test_route_path_params():
+    route = Route("/{greeting}/{id:int}/{price:float}", lambda req, resp: None)
+
+    assert route.path_params(["hello", "1", "9.5"]) == {
+        "greeting": "hello",
+        "id": 1,
+        "price": 9.5,
+    }
+    assert Route("/", lambda req, resp: None).path_params([]) == {}
+
+
 def test_websocket_route_repr():
     def chat_endpoint(ws):
         """Chat"""
@@ -59,6 +77,8 @@ def test_route_eq():
         pass
 
     assert WebSocketRoute("/", home) == WebSocketRoute("/", home)
+    assert Route("/", home) != WebSocketRoute("/", home)
+    assert len({Route("/", home), Route("/", home), Route("/other", home)}) == 2
 
 
 """
@@ -106,6 +126,18 @@ def test_requests_session_works(api):
     assert api.requests.get("/").text == TEXT
 
 
+def test_requests_session_reuses_event_loop(api):
+    loops = []
+
+    @api.route("/")
+    async def route(req, resp):
+        loops.append(asyncio.get_running_loop())
+
+    api.requests.get("/")
+    api.requests.get("/")
+    assert loops[0] is loops[1]
+
+
 def test_status_code(api):
     @api.route("/")
     def hello(req, resp):
@@ -166,6 +198,30 @@ def test_mote_argumented_routing(api):
     assert r.text == "hello, lyndsy."
 
 
+def test_url_for(api):
+    @api.route("/item/{id:int}")
+    def item(req, resp, *, id):
+        resp.media = {"id": id}
+
+    assert api.url_for(item, id=1) == "/item/1"
+    assert api.url_for("item", id=2) == "/item/2"
+    assert api.url_for("late") is None
+
+    @api.route("/late")
+    def late(req, resp):
+        pass
+
+    assert api.url_for("late") == "/late"
+
+    @api.route("/price/{amount}")
+    def price(req, resp, *, amount):
+        pass
+
+    assert api.url_for(price, amount=1) == "/price/1"
+    assert api.url_for(price, amount=1.0) == "/price/1.0"
+    assert api.url_for(price, amount=True) == "/price/True"
+
+
 def test_request_and_get(api):
     @api.route("/")
     class ThingsResource:
@@ -200,6 +256,11 @@ def test_query_params(api, url):
     r = api.requests.get(url("/?q=1&q=2&q=3"))
     assert r.json()["params"] == {"q": "3"}
 
+    # A raw, not percent-encoded, UTF-8 query string.
+    scope = {"type": "http", "headers": [], "query_string": "q=café".encode()}
+    req = dyne.models.Request(scope, None)
+    assert req.params == {"q": ["café"]}
+
 
 # Requires https://github.com/encode/starlette/pull/102
 def test_form_data(api):
@@ -425,6 +486,21 @@ def test_schema_generation():
     assert dump
     assert dump["openapi"] == "3.0.2"
 
+    # Changes to the API's details show up in later responses.
+    api.openapi.title = "Pet Service"
+    api.openapi.contact = {"name": "API Support"}
+    dump = yaml.safe_load(api.requests.get("http://;/schema.yaml").content)
+    assert dump["info"]["title"] == "Pet Service"
+    assert dump["info"]["contact"] == {"name": "API Support"}
+
+    api.openapi.contact["name"] = "Pet Support"
+    dump = yaml.safe_load(api.requests.get("http://;/schema.yaml").content)
+    assert dump["info"]["contact"] == {"name": "Pet Support"}
+
+    assert "Pet Service" in api.requests.get("http://;/docs").text
+    api.openapi.title = "Cat Service"
+    assert "Cat Service" in api.requests.get("http://;/docs").text
+
 
 def test_documentation_explicit():
     import marshmallow
@@ -539,8 +615,30 @@ def test_mount_wsgi_app(api, flask):
 
     api.mount("/flask", flask)
 
-    r = api.requests.get("http://;/flask")
+    for _ in range(2):
+        r = api.requests.get("http://;/flask")
+        assert r.status_code == 200
+        assert r.text == "Hello World!"
+
+
+def test_mount_asgi_app(api):
+    calls = []
+
+    async def app(scope, receive, send):
+        calls.append(scope["path"])
+        if len(calls) == 1:
+            raise TypeError("boom")
+        await PlainTextResponse("hello")(scope, receive, send)
+
+    api.mount("/asgi", app)
+
+    with pytest.raises(TypeError):
+        api.requests.get("http://;/asgi/")
+
+    # The error doesn't get the app mistaken for a WSGI one.
+    r = api.requests.get("http://;/asgi/")
     assert r.status_code == 200
+    assert r.text == "hello"
 
 
 def test_async_class_based_views(api):
@@ -554,6 +652,32 @@ def test_async_class_based_views(api):
     assert r.text == data
 
 
+def test_async_requests(api):
+    @api.route("/")
+    async def route(req, resp):
+        resp.media = {"hello": "world"}
+
+    async def fetch():
+        return await api.arequests.get(api.url_for(route))
+
+    assert asyncio.run(fetch()).json() == {"hello": "world"}
+    assert asyncio.run(fetch()).json() == {"hello": "world"}
+
+    # A closed client is replaced on next use.
+    asyncio.run(api.arequests.aclose())
+    assert asyncio.run(fetch()).json() == {"hello": "world"}
+
+
+def test_request_content_bodyless_methods(api):
+    @api.route("/", methods=["GET", "DELETE"])
+    async def route(req, resp):
+        resp.content = await req.content
+
+    assert api.requests.get(api.url_for(route)).content == b""
+    r = api.requests.request("DELETE", api.url_for(route), content=b"payload")
+    assert r.content == b"payload"
+
+
 def test_cookies(api):
     @api.route("/")
     def home(req, resp):
@@ -629,6 +753,14 @@ def test_template(api, template_path):
     assert r.text == "test"
 
 
+def test_template_bytecode_cache(tmpdir):
+    assert dyne.API().templates._env.bytecode_cache is None
+
+    cache = jinja2.FileSystemBytecodeCache(str(tmpdir))
+    api = dyne.API(template_bytecode_cache=cache)
+    assert api.templates._env.bytecode_cache is cache
+
+
 def test_template_async(api, template_path):
     templates = Templates(directory=template_path.dirpath(), enable_async=True)
 
@@ -810,6 +942,22 @@ def test_before_response(api, session):
     assert "x-pizza" in r.headers
 
 
+def test_before_request_runs_on_405(api):
+    calls = []
+
+    @api.route("/get")
+    def get(req, resp):
+        pass
+
+    @api.route(before_request=True)
+    def before_request(req, resp):
+        calls.append(req.method)
+
+    r = api.requests.post(api.url_for(get))
+    assert r.status_code == api.status_codes.HTTP_405
+    assert calls == ["post"]
+
+
 @pytest.mark.parametrize("enable_hsts", [True, False])
 @pytest.mark.parametrize("cors", [True, False])
 def test_allowed_hosts(enable_hsts, cors):
@@ -862,10 +1010,7 @@ def test_allowed_hosts(enable_hsts, cors):
 
 def create_asset(static_dir, name=None, parent_dir=None):
     if name is None:
-        name = random.choices(string.ascii_letters, k=6)
-        # :3
-        ext = random.choices(string.ascii_letters, k=2)
-        name = f"{name}.{ext}"
+        name = f"{secrets.token_hex(3)}.{secrets.token_hex(1)}"
 
     if parent_dir is None:
         parent_dir = static_dir
@@ -1012,6 +1157,49 @@ def test_path_matches_route(api):
     assert not api.path_matches_route({"type": "http", "path": "/foo"})
 
 
+def test_route_precedence(api):
+    @api.route("/{greeting}/{name}")
+    def greet(req, resp, *, greeting, name):
+        resp.text = f"{greeting}, {name}."
+
+    @api.route("/hello/world")
+    def hello_world(req, resp):
+        resp.text = "static"
+
+    @api.route("/item/{id:int}")
+    def item(req, resp, *, id):
+        resp.media = {"id": id}
+
+    @api.route("/files/{rest:path}")
+    def files(req, resp, *, rest):
+        resp.text = rest
+
+    @api.route("/report-{year:int}.csv")
+    def report(req, resp, *, year):
+        resp.media = {"year": year}
+
+    @api.route("/price-{amount:float}")
+    def price(req, resp, *, amount):
+        resp.media = {"amount": amount}
+
+    assert api.requests.get("/hello/world").text == "static"
+    assert api.requests.get("/hello/sean").text == "hello, sean."
+    assert api.requests.get("/item/42").json() == {"id": 42}
+    assert api.requests.get("/item/abc").text == "item, abc."
+    assert api.requests.get("/files/css/app.css").text == "css/app.css"
+    assert api.requests.get("/report-2024.csv").json() == {"year": 2024}
+    assert api.requests.get("/price-9.99").json() == {"amount": 9.99}
+    assert api.requests.post("/hello/world").status_code == api.status_codes.HTTP_405
+
+    # Routes only matched by regex still win over trie routes registered later.
+    @api.route("/{slug}")
+    def page(req, resp, *, slug):
+        resp.text = slug
+
+    assert api.requests.get("/report-2024.csv").json() == {"year": 2024}
+    assert api.requests.get("/about").text == "about"
+
+
 def test_route_without_endpoint(api):
     api.add_route("/")
     route = api.router.routes[0]
@@ -1061,6 +1249,50 @@ def test_pydantic_input_request_validation(api):
     assert response.status_code == api.status_codes.HTTP_400
     assert "error" in response.text
 
+    # Malformed JSON
+    response = api.requests.post(
+        api.url_for(create_item),
+        content=b'{"name": ',
+        headers={"Content-Type": "application/json"},
+    )
+    assert response.status_code == api.status_codes.HTTP_400
+    assert response.json()["errors"][0]["type"] == "json_invalid"
+
+    # UTF-16 and UTF-32 JSON, which only json.loads detects
+    for encoding in ("utf-16", "utf-16-le", "utf-32"):
+        response = api.requests.post(
+            api.url_for(create_item),
+            content='{"name": "Test Item"}'.encode(encoding),
+            headers={"Content-Type": "application/json"},
+        )
+        assert response.status_code == api.status_codes.HTTP_200
+
+
+def test_input_many(api):
+    class PydanticItem(BaseModel):
+        name: str
+
+    class MarshmallowItem(Schema):
+        name = fields.Str(required=True)
+
+    @api.route("/pydantic", methods=["POST"])
+    @api.input(PydanticItem, many=True)
+    async def create_pydantic(req, resp, *, data):
+        resp.media = {"count": len(data)}
+
+    @api.route("/marshmallow", methods=["POST"])
+    @api.input(MarshmallowItem, many=True)
+    async def create_marshmallow(req, resp, *, data):
+        resp.media = {"count": len(data)}
+
+    items = [{"name": "Scooter"}, {"name": "Bike"}]
+    for endpoint in (create_pydantic, create_marshmallow):
+        response = api.requests.post(api.url_for(endpoint), json=items)
+        assert response.json() == {"count": 2}
+
+        response = api.requests.post(api.url_for(endpoint), json=[{"name": [1]}])
+        assert response.status_code == api.status_codes.HTTP_400
+
 
 def test_marshmallow_input_request_validation(api):
     class ItemSchema(Schema):
@@ -1198,12 +1430,15 @@ def test_pydantic_response_schema_serialization(api):
         title = Column(String)
 
     # Create tables in the database
-    engine = create_engine("sqlite:///py.db", connect_args={"check_same_thread": False})
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
     Base.metadata.create_all(engine)
 
     # Create a session
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
 
     book1 = Book(price=9.99, title="Harry Potter")
     book2 = Book(price=10.99, title="Pirates of the sea")
@@ -1255,7 +1490,10 @@ def test_pydantic_response_schema_serialization(api):
     assert ids == [1, 2, 3]
     assert prices == [9.99, 10.99, 39.99]
     assert titles == ["Harry Potter", "Learning dyne", "Pirates of the sea"]
-    os.remove("py.db")
+
+    response = api.requests.get(api.url_for(all_books), headers={"Accept": "yaml"})
+    assert "yaml" in response.headers["Content-Type"]
+    assert len(yaml.safe_load(response.content)) == 3
 
 
 def test_marshmallow_response_schema_serialization(api):
@@ -1270,12 +1508,15 @@ def test_marshmallow_response_schema_serialization(api):
         title = Column(String)
 
     # Create tables in the database
-    engine = create_engine("sqlite:///ma.db", connect_args={"check_same_thread": False})
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
     Base.metadata.create_all(engine)
 
     # Create a session
-    Session = sessionmaker(bind=engine)
-    session = Session()
+    session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
 
     book1 = Book(price=9.99, title="Harry Potter")
     book2 = Book(price=10.99, title="Pirates of the sea")
@@ -1325,4 +1566,122 @@ def test_marshmallow_response_schema_serialization(api):
     assert ids == [1, 2, 3]
     assert prices == [9.99, 10.99, 11.99]
     assert titles == ["Harry Potter", "Pirates of the sea", "Python Programming"]
-    os.remove("ma.db")
+
+
+def test_output_joined_query(api):
+    class Base(DeclarativeBase):
+        pass
+
+    class Author(Base):
+        __tablename__ = "authors"
+        id = Column(Integer, primary_key=True)
+        name = Column(String)
+        books = relationship("Book")
+
+    class Book(Base):
+        __tablename__ = "books"
+        id = Column(Integer, primary_key=True)
+        author_id = Column(Integer, ForeignKey("authors.id"))
+
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+    session.add(Author(name="x", books=[Book(), Book()]))
+    session.commit()
+
+    class AuthorModel(BaseModel):
+        id: int
+        name: str
+        model_config = ConfigDict(from_attributes=True)
+
+    class AuthorSchema(Schema):
+        id = fields.Integer()
+        name = fields.Str()
+
+    @api.route("/pydantic")
+    @api.output(AuthorModel)
+    async def pydantic_authors(req, resp):
+        resp.obj = session.query(Author).join(Author.books)
+
+    @api.route("/marshmallow")
+    @api.output(AuthorSchema)
+    async def marshmallow_authors(req, resp):
+        resp.obj = session.query(Author).join(Author.books)
+
+    @api.route("/plain")
+    @api.output(AuthorModel)
+    async def plain_authors(req, resp):
+        resp.obj = session.query(Author)
+
+    # The author is returned once, not once per book.
+    for endpoint in (pydantic_authors, marshmallow_authors, plain_authors):
+        response = api.requests.get(api.url_for(endpoint))
+        assert response.json() == [{"id": 1, "name": "x"}]
+
+
+def test_output_schemas_reading_objects(api):
+    class Base(DeclarativeBase):
+        pass
+
+    class Book(Base):
+        __tablename__ = "books"
+        id = Column(Integer, primary_key=True)
+        title = Column(String)
+
+    engine = create_engine(
+        "sqlite://",
+        poolclass=StaticPool,
+        connect_args={"check_same_thread": False},
+    )
+    Base.metadata.create_all(engine)
+    session = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
+
+    session.add(Book(title="dyne"))
+    session.commit()
+
+    class MethodSchema(Schema):
+        id = fields.Integer()
+        title = fields.Method("get_title")
+
+        def get_title(self, book):
+            return book.title.upper()
+
+    class HookSchema(Schema):
+        id = fields.Integer()
+        title = fields.Str()
+
+        @pre_dump
+        def check(self, book, **kwargs):
+            assert isinstance(book, Book)
+            return book
+
+    class ValidatedModel(BaseModel):
+        id: int
+        title: str
+        model_config = ConfigDict(from_attributes=True)
+
+        @model_validator(mode="before")
+        @classmethod
+        def check(cls, book):
+            assert book.id == 1
+            return book
+
+    # These schemas are given the ORM objects, not rows of their columns.
+    for schema, expected in (
+        (MethodSchema, [{"id": 1, "title": "DYNE"}]),
+        (HookSchema, [{"id": 1, "title": "dyne"}]),
+        (ValidatedModel, [{"id": 1, "title": "dyne"}]),
+    ):
+
+        @api.route(f"/{schema.__name__}")
+        @api.output(schema)
+        async def books(req, resp):
+            resp.obj = session.query(Book)
+
+        response = api.requests.get(f"/{schema.__name__}")
+        assert response.json() == expected
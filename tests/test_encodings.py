@@ -1,3 +1,12 @@
+import datetime
+import json
+import uuid
+
+import pytest
+
+from dyne import formats
+
+
 def test_custom_encoding(api, session):
     data = "hi alex!"
 
@@ -19,3 +28,15 @@ def test_bytes_encoding(api, session):
 
     r = session.post(api.url_for(route), content=data)
     assert r.content == data
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_json_dumps_backends(monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(formats, "orjson", None)
+
+    value = uuid.UUID(int=1)
+    assert json.loads(formats.dumps({"id": value})) == {"id": str(value)}
+
+    with pytest.raises(TypeError):
+        formats.dumps({"t": datetime.datetime(2024, 1, 1)})
@@ -1,3 +1,4 @@
+import asyncio
 import inspect
 
 import pytest
@@ -58,3 +59,19 @@ def test_query_dict_items():
     items = d.items()
     assert inspect.isgenerator(items)
     assert dict(items) == {"q": "{ hello }", "name": "myname", "user_name": "test_user"}
+
+
+def test_coalesce_stream():
+    async def chunks():
+        yield "a"
+        yield b"b"
+        await asyncio.sleep(0)
+        yield "c"
+        yield "d" * 8
+
+    async def collect(limit):
+        return [c async for c in models.coalesce_stream(chunks(), "utf-8", limit)]
+
+    assert asyncio.run(collect(1024)) == [b"ab", b"cdddddddd"]
+    assert asyncio.run(collect(4)) == [b"ab", b"cdddddddd"]
+    assert asyncio.run(collect(1)) == [b"a", b"b", b"c", b"dddddddd"]